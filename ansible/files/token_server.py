@@ -65,7 +65,8 @@ Red team retrieves token with:
 # - http.server: Built-in HTTP server functionality
 # - sys: System-specific parameters (like command line arguments)
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import signal
 import sys
 
 # ==============================================================================
@@ -77,6 +78,74 @@ import sys
 TOKEN_FILE = '/opt/scoring-engine/red-token.txt'
 
 
+def _load_token():
+    """
+    Read the token file once and return it as bytes (or None if missing).
+
+    WHY CACHE THE TOKEN?
+    The token never changes while the server is running, but the old code
+    re-opened and re-read the file on EVERY request. That's three system
+    calls (open, read, close) plus string processing per request - wasted
+    work, and it matters if someone hammers the endpoint.
+
+    Instead we read the file ONCE at startup, do the .strip() and .encode()
+    up front, and serve the same bytes object forever. Serving a request
+    becomes a simple memory copy.
+    """
+    try:
+        with open(TOKEN_FILE, 'r') as f:
+            return f.read().strip().encode()
+    except FileNotFoundError:
+        # No token file - remember that so requests get a clear error
+        return None
+
+
+def _build_response(status_line, body):
+    """
+    Assemble a complete HTTP response (status line + headers + body) as
+    one bytes object.
+
+    WHY PRE-BUILD RESPONSES?
+    send_response() + send_header() + end_headers() + wfile.write() each
+    do their own formatting and buffer writes on every request. But our
+    three possible responses (token, 404, 500) never change! Building
+    each one once at startup means serving a request is a single
+    wfile.write() of a ready-made byte string - no per-request string
+    formatting at all.
+
+    An HTTP response on the wire looks like:
+        HTTP/1.1 200 OK\r\n        <- status line
+        Content-Type: text/plain\r\n   <- headers, one per line
+        Content-Length: 32\r\n
+        Connection: close\r\n
+        \r\n                        <- blank line = "headers done"
+        <body bytes>
+    """
+    return (status_line
+            + b'Content-Type: text/plain\r\n'
+            + b'Content-Length: ' + str(len(body)).encode() + b'\r\n'
+            + b'Connection: close\r\n'
+            + b'\r\n'
+            + body)
+
+
+def _install_responses():
+    """
+    (Re)build the canned responses and attach them to TokenHandler.
+
+    Called once at startup and again on SIGHUP when the token rotates.
+    """
+    token = _load_token()
+    if token is not None:
+        TokenHandler.response_ok = _build_response(b'HTTP/1.1 200 OK\r\n', token)
+    else:
+        TokenHandler.response_ok = None
+    TokenHandler.response_500 = _build_response(
+        b'HTTP/1.1 500 Internal Server Error\r\n', b'Token not configured')
+    TokenHandler.response_404 = _build_response(
+        b'HTTP/1.1 404 Not Found\r\n', b'Not found. Use GET /token')
+
+
 # ==============================================================================
 # HTTP REQUEST HANDLER
 # ==============================================================================
@@ -105,55 +174,39 @@ class TokenHandler(BaseHTTPRequestHandler):
     - 500 = Internal Server Error (something broke on our end)
     """
 
+    # Complete pre-built responses, installed at startup by
+    # _install_responses(). These are CLASS ATTRIBUTES - shared by every
+    # request, so no request ever touches the filesystem or formats
+    # headers. response_ok is None when the token file was missing.
+    response_ok = None
+    response_500 = None
+    response_404 = None
+
     def do_GET(self):
         """
         Handle GET requests.
 
         This method is called automatically when someone makes a GET request.
         self.path contains the URL path (e.g., "/token" or "/wrong-path")
+
+        Every possible response was pre-built at startup, so all we do
+        here is pick the right one and write it to the socket in a single
+        call - no file I/O, no string formatting, one write.
         """
         # Check if they're requesting the token endpoint
         if self.path == '/token':
-            # Try to read and serve the token file
-            try:
-                # 'with' statement = "context manager"
-                # It automatically closes the file when we're done,
-                # even if an error occurs. Always use 'with' for files!
-                with open(TOKEN_FILE, 'r') as f:
-                    # .read() gets the whole file contents
-                    # .strip() removes whitespace/newlines from edges
-                    token = f.read().strip()
-
-                # Send HTTP 200 OK response
-                self.send_response(200)
-
-                # HTTP headers describe the response
-                # Content-Type tells the client what kind of data this is
-                self.send_header('Content-Type', 'text/plain')
-
-                # Content-Length tells the client how many bytes to expect
-                self.send_header('Content-Length', len(token))
-
-                # end_headers() sends a blank line, signaling headers are done
-                self.end_headers()
-
-                # wfile = "write file" - the connection to send data back
-                # .encode() converts string to bytes (required for network)
-                self.wfile.write(token.encode())
-
-            except FileNotFoundError:
-                # Token file doesn't exist - server misconfigured
-                self.send_response(500)  # Internal Server Error
-                self.send_header('Content-Type', 'text/plain')
-                self.end_headers()
-                self.wfile.write(b'Token not configured')
-                # Note: b'...' is a "bytes literal" - already encoded
+            # response_ok is None if the token file was missing at startup
+            blob = self.response_ok if self.response_ok is not None else self.response_500
         else:
             # They requested something other than /token
-            self.send_response(404)  # Not Found
-            self.send_header('Content-Type', 'text/plain')
-            self.end_headers()
-            self.wfile.write(b'Not found. Use GET /token')
+            blob = self.response_404
+
+        # wfile = "write file" - the connection to send data back.
+        # The blob already contains the status line, headers, and body.
+        self.wfile.write(blob)
+
+        # We told the client "Connection: close", so follow through
+        self.close_connection = True
 
     def log_message(self, format, *args):
         """
@@ -184,11 +237,30 @@ def main():
     # int() converts the string argument to an integer
     port = int(sys.argv[1]) if len(sys.argv) > 1 else 8081
 
+    # Load the token and pre-build all responses once, up front
+    # (see _load_token and _build_response for why)
+    _install_responses()
+
+    # If the token is ever rotated on disk, send the server SIGHUP to
+    # re-read it without a restart: kill -HUP <pid>
+    # (signal handlers are another Python feature worth knowing!)
+    signal.signal(signal.SIGHUP, lambda signum, frame: _install_responses())
+
     # Create the HTTP server
     # ('0.0.0.0', port) means "listen on all network interfaces on this port"
     # '0.0.0.0' = all interfaces (vs '127.0.0.1' = localhost only)
     # TokenHandler = our custom class that handles requests
-    server = HTTPServer(('0.0.0.0', port), TokenHandler)
+    #
+    # WHY ThreadingHTTPServer?
+    # The plain HTTPServer handles one request at a time, so a single slow
+    # client would make every other Red Team member wait in line. The
+    # threading version handles each request in its own thread. Since our
+    # handler only READS a pre-loaded bytes object (it never writes shared
+    # state), this is safe without any locking.
+    server = ThreadingHTTPServer(('0.0.0.0', port), TokenHandler)
+
+    # daemon_threads = don't let a stuck client thread block shutdown
+    server.daemon_threads = True
 
     # Print helpful startup message
     print(f'Token server running on port {port}')
@@ -18,81 +18,228 @@ Exit codes:
 """
 
 import argparse
+import http.client
 import json
-import re
 import sys
 import time
-from urllib.request import urlopen, Request
 from urllib.error import URLError, HTTPError
+from urllib.parse import urlsplit
+
+# Markers for the scoreboard's templated HTML. The layout is stable enough
+# that plain substring scanning beats the regex engine: bytes.find is a
+# tight C loop with no pattern state or per-match capture objects, which
+# matters because parse_scoreboard() runs on every poll in wait_for_green().
+# Bytes markers let us scan the HTTP body directly without decoding the
+# whole page first; only the matched names get decoded.
+_NAME_MARK = b'checkname"><div><p>'
+_NAME_END = b'</p>'
+_UP_MARK = b'up.png'
+_DOWN_MARK = b'down.png'
+
+# Refuse to buffer more than this much scoreboard HTML. A healthy page is
+# well under 1 MB; anything bigger means something is wrong upstream and
+# we'd rather fail than balloon memory.
+MAX_SCOREBOARD_BYTES = 4 * 1024 * 1024
 
 
 def parse_scoreboard(html_content):
     """
-    Parse the scoreboard HTML to extract service names and their status.
-
-    Returns a list of dicts: [{"name": "dc01-ping", "status": "up"}, ...]
+    Parse the scoreboard HTML (as bytes) to extract service names and
+    their status. Only the matched names are decoded, so the page is
+    never copied into a second str-typed buffer.
+
+    The scoreboard renders check names as a row of rotated column
+    headers (that's what the checkname div/p wrapper is for) with the
+    status icon grid in separate team rows below - names and icons are
+    NOT interleaved per check. So the two are collected in independent
+    document-order scans and paired positionally, the same pairing the
+    engine's own template uses: Nth header column <-> Nth icon cell.
+    Every step is a bounded bytes.find, so parse time stays O(page size).
+
+    Returns two parallel lists (names, statuses) rather than one dict per
+    row - the polling loop only needs aggregate counts, so the dict view
+    is built lazily by callers that actually report per-service detail.
+    Counting is then a single C-level statuses.count("down").
     """
-    services = []
+    # Scan 1: check names from the header row, in document order
+    names = []
+    pos = 0
+    while True:
+        start = html_content.find(_NAME_MARK, pos)
+        if start < 0:
+            break
+        start += len(_NAME_MARK)
+        end = html_content.find(_NAME_END, start)
+        if end < 0:
+            break
+        names.append(html_content[start:end].decode('utf-8', 'replace'))
+        pos = end + len(_NAME_END)
+
+    # Scan 2: status icons, in document order
+    statuses = []
+    pos = 0
+    while True:
+        up_at = html_content.find(_UP_MARK, pos)
+        down_at = html_content.find(_DOWN_MARK, pos)
+        if up_at < 0 and down_at < 0:
+            break
+        if up_at >= 0 and (down_at < 0 or up_at < down_at):
+            statuses.append("up")
+            pos = up_at + len(_UP_MARK)
+        else:
+            statuses.append("down")
+            pos = down_at + len(_DOWN_MARK)
+
+    # Pair positionally; on a malformed page where the counts disagree,
+    # truncate to the shorter list (the behavior zip() always gave this
+    # script) so the lists stay parallel for callers
+    if len(names) != len(statuses):
+        shorter = min(len(names), len(statuses))
+        del names[shorter:]
+        del statuses[shorter:]
 
-    # Extract check names from the HTML
-    # Pattern: checkname"><div><p>SERVICE_NAME</p>
-    check_pattern = r'checkname"><div><p>([^<]+)</p>'
-    check_names = re.findall(check_pattern, html_content)
+    return names, statuses
 
-    # Extract status indicators (up.png or down.png)
-    status_pattern = r'(up|down)\.png'
-    statuses = re.findall(status_pattern, html_content)
 
-    # Match names to statuses
-    for i, name in enumerate(check_names):
-        if i < len(statuses):
-            services.append({
-                "name": name,
-                "status": statuses[i]
-            })
+# Cached keep-alive connections, keyed by (scheme, host:port). wait_for_green
+# polls the same engine every few seconds; reusing one connection avoids a
+# fresh TCP handshake per poll.
+_connections = {}
 
-    return services
+
+def _get_connection(base_url, timeout=30):
+    """
+    Return a cached keep-alive connection to the scoring engine,
+    creating it on first use.
+    """
+    parts = urlsplit(base_url)
+    key = (parts.scheme, parts.netloc)
+    conn = _connections.get(key)
+    if conn is None:
+        if parts.scheme == 'https':
+            conn = http.client.HTTPSConnection(parts.netloc, timeout=timeout)
+        else:
+            conn = http.client.HTTPConnection(parts.netloc, timeout=timeout)
+        _connections[key] = conn
+    return conn
 
 
-def get_scoreboard(base_url, timeout=30):
+def _drop_connection(base_url):
+    """Close and forget the cached connection (it went stale)."""
+    parts = urlsplit(base_url)
+    conn = _connections.pop((parts.scheme, parts.netloc), None)
+    if conn is not None:
+        conn.close()
+
+
+def get_scoreboard(base_url, timeout=30, etag=None, last_modified=None):
     """
     Fetch the scoreboard page from the scoring engine.
 
-    Returns the HTML content as a string.
-    Raises URLError on connection failure.
+    Reuses a single keep-alive connection across polls instead of opening
+    a new TCP connection per request. When etag/last_modified from a prior
+    fetch are passed in, sends a conditional GET so an unchanged page comes
+    back as a bodyless 304 and the caller can skip re-parsing.
+
+    Returns a tuple (html, etag, last_modified). html is the raw response
+    bytes (parse_scoreboard scans them directly, skipping a full decode),
+    or None when the server answered 304 Not Modified (reuse the previous
+    parse). Responses over MAX_SCOREBOARD_BYTES are rejected rather than
+    buffered.
+    Raises URLError on connection failure, HTTPError on bad status.
     """
+    # The request target keeps any path prefix from the base URL (e.g.
+    # --url http://host/engine fetches /engine/scoreboard, not /scoreboard)
+    target = urlsplit(base_url).path.rstrip('/') + "/scoreboard"
     url = f"{base_url.rstrip('/')}/scoreboard"
-    request = Request(url, headers={"User-Agent": "Ansible-Validation/1.0"})
+    headers = {"User-Agent": "Ansible-Validation/1.0"}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    # Two attempts: the server may have closed the cached keep-alive
+    # connection between polls, in which case we reconnect once.
+    for attempt in (1, 2):
+        conn = _get_connection(base_url, timeout)
+        try:
+            conn.request("GET", target, headers=headers)
+            response = conn.getresponse()
+            # Read one byte past the cap so an oversized body is
+            # detectable without buffering all of it
+            body = response.read(MAX_SCOREBOARD_BYTES + 1)
+        except (http.client.HTTPException, OSError) as e:
+            _drop_connection(base_url)
+            if attempt == 2:
+                raise URLError(e)
+            continue
+
+        if len(body) > MAX_SCOREBOARD_BYTES:
+            # The connection still has unread data; don't try to reuse it
+            _drop_connection(base_url)
+            raise URLError(
+                f"scoreboard response exceeds {MAX_SCOREBOARD_BYTES} bytes"
+            )
+
+        if response.status == 304:
+            # Unchanged since last poll - keep the old validators
+            return None, etag, last_modified
 
-    with urlopen(request, timeout=timeout) as response:
-        return response.read().decode('utf-8')
+        if response.status >= 400:
+            raise HTTPError(url, response.status, response.reason,
+                            response.headers, None)
 
+        return (body,
+                response.getheader('ETag'),
+                response.getheader('Last-Modified'))
 
-def validate_services(services):
+
+def validate_services(names, statuses):
     """
-    Check if all services are UP.
+    Check if all services are UP, given the parallel lists from
+    parse_scoreboard.
+
+    The down-names list is only materialized when there is actually
+    something down to report.
 
-    Returns a tuple: (all_passing, down_services)
+    Returns a tuple: (all_passing, down_names)
     """
-    down_services = [s for s in services if s["status"] == "down"]
-    return len(down_services) == 0, down_services
+    if statuses.count("down") == 0:
+        return True, []
+    return False, [n for n, s in zip(names, statuses) if s == "down"]
 
 
-def wait_for_green(base_url, max_wait=300, interval=10, verbose=True):
+def wait_for_green(base_url, max_wait=300, interval=10, verbose=True,
+                   poll_min=0.05, poll_base=1.3, poll_max=60):
     """
     Wait for all services to report as UP.
 
+    Polls with exponential backoff: the first checks fire almost
+    immediately (so a scoreboard that is already green is detected in
+    well under a second), then the delay grows by poll_base per poll up
+    to the configured interval. Connection errors back off harder
+    (doubling, capped at poll_max) to avoid hammering an engine that is
+    still starting up.
+
     Args:
         base_url: Scoring engine URL
         max_wait: Maximum seconds to wait
-        interval: Seconds between checks
+        interval: Ceiling for the delay between successful checks
         verbose: Print status updates
+        poll_min: Initial delay between polls (seconds)
+        poll_base: Growth factor applied after each successful check
+        poll_max: Ceiling for the delay after connection errors (seconds)
 
     Returns:
-        Tuple of (success, services, elapsed_time)
+        Tuple of (success, names, statuses, elapsed_time) where names and
+        statuses are the parallel lists from parse_scoreboard
     """
     start_time = time.time()
-    last_down_count = None
+    last_log_key = None
+    names = []
+    statuses = []
+    etag = last_modified = None
+    delay = poll_min
 
     while True:
         elapsed = time.time() - start_time
@@ -100,32 +247,45 @@ def wait_for_green(base_url, max_wait=300, interval=10, verbose=True):
         if elapsed > max_wait:
             if verbose:
                 print(f"Timeout after {int(elapsed)}s waiting for services")
-            return False, [], elapsed
+            return False, [], [], elapsed
 
         try:
-            html = get_scoreboard(base_url)
-            services = parse_scoreboard(html)
-            all_passing, down_services = validate_services(services)
-
-            current_down = len(down_services)
+            html, etag, last_modified = get_scoreboard(
+                base_url, etag=etag, last_modified=last_modified
+            )
+            if html is not None:
+                # Page changed (or first fetch) - re-parse it
+                names, statuses = parse_scoreboard(html)
+            # On 304 Not Modified, keep the previous parse
+            all_passing, down_names = validate_services(names, statuses)
 
-            if verbose and current_down != last_down_count:
-                up_count = len(services) - current_down
-                print(f"[{int(elapsed)}s] Services: {up_count}/{len(services)} UP")
-                if down_services:
-                    for svc in down_services:
-                        print(f"  - {svc['name']}: DOWN")
-                last_down_count = current_down
+            if verbose:
+                # Only log when the set of down services actually changed,
+                # not just its size - a long wait where the same service
+                # flaps doesn't regenerate identical output every poll
+                log_key = (len(down_names), tuple(sorted(down_names)))
+                if log_key != last_log_key:
+                    up_count = len(statuses) - len(down_names)
+                    print(f"[{int(elapsed)}s] Services: {up_count}/{len(statuses)} UP")
+                    if down_names:
+                        print("\n".join(
+                            f"  - {name}: DOWN" for name in log_key[1]
+                        ))
+                    last_log_key = log_key
 
             if all_passing:
-                return True, services, elapsed
+                return True, names, statuses, elapsed
 
-            time.sleep(interval)
+            time.sleep(delay)
+            # Successful check: ease the poll rate up toward the interval
+            delay = min(delay * poll_base, interval)
 
         except (URLError, HTTPError) as e:
             if verbose:
                 print(f"[{int(elapsed)}s] Connection error: {e}")
-            time.sleep(interval)
+            time.sleep(delay)
+            # Engine unreachable: back off harder to reduce pressure
+            delay = min(delay * 2, poll_max)
 
 
 def main():
@@ -149,6 +309,24 @@ def main():
         default=10,
         help="Seconds between checks when waiting (default: 10)"
     )
+    parser.add_argument(
+        "--poll-min",
+        type=float,
+        default=0.05,
+        help="Initial delay between polls in seconds (default: 0.05)"
+    )
+    parser.add_argument(
+        "--poll-base",
+        type=float,
+        default=1.3,
+        help="Backoff growth factor per successful poll (default: 1.3)"
+    )
+    parser.add_argument(
+        "--poll-max",
+        type=float,
+        default=60,
+        help="Max delay after connection errors in seconds (default: 60)"
+    )
     parser.add_argument(
         "--json", "-j",
         action="store_true",
@@ -165,22 +343,29 @@ def main():
     try:
         if args.wait > 0:
             # Wait mode: keep checking until all green or timeout
-            success, services, elapsed = wait_for_green(
+            success, names, statuses, elapsed = wait_for_green(
                 args.url,
                 max_wait=args.wait,
                 interval=args.interval,
-                verbose=not args.quiet
+                verbose=not args.quiet,
+                poll_min=args.poll_min,
+                poll_base=args.poll_base,
+                poll_max=args.poll_max
             )
         else:
             # Single check mode
-            html = get_scoreboard(args.url)
-            services = parse_scoreboard(html)
-            success, down_services = validate_services(services)
+            html, _, _ = get_scoreboard(args.url)
+            names, statuses = parse_scoreboard(html)
+            success, _ = validate_services(names, statuses)
             elapsed = 0
 
-        # Prepare result
-        up_count = sum(1 for s in services if s["status"] == "up")
-        down_count = len(services) - up_count
+        # Aggregate counts in one C-level pass; the per-service dict view
+        # is only built here, for the report
+        down_count = statuses.count("down")
+        up_count = len(statuses) - down_count
+        services = [
+            {"name": n, "status": s} for n, s in zip(names, statuses)
+        ]
 
         result = {
             "success": success,
@@ -208,9 +393,9 @@ def main():
             else:
                 print("STATUS: SERVICES FAILING")
                 print("\nFailing services:")
-                for svc in services:
-                    if svc["status"] == "down":
-                        print(f"  - {svc['name']}")
+                for name, status in zip(names, statuses):
+                    if status == "down":
+                        print(f"  - {name}")
 
             print("=" * 50)
 
@@ -31,11 +31,12 @@ Group hierarchies for convenience:
   [linux_members:children] - All Linux VMs (Blue Linux + Red Kali)
 
 USAGE:
-  python3 import-tofu-to-ansible.py [tofu_dir] [ansible_dir] [inventory_file]
+  python3 import-tofu-to-ansible.py [--no-cache] [tofu_dir] [ansible_dir] [inventory_file]
 
 EXAMPLES:
   python3 import-tofu-to-ansible.py
   python3 import-tofu-to-ansible.py opentofu ansible inventory/production.ini
+  python3 import-tofu-to-ansible.py --no-cache
 
 ==============================================================================
 """
@@ -43,11 +44,247 @@ EXAMPLES:
 import json
 import subprocess
 import sys
-import os
+from collections import defaultdict
+from operator import itemgetter
 from pathlib import Path
 
+# OPTIONAL SPEEDUP: orjson is a much faster JSON parser (written in Rust).
+# 'tofu output -json' can be a multi-megabyte blob on a big deployment, and
+# parsing it is the main CPU cost of this script. If orjson is installed
+# (pip3 install orjson) we use it; otherwise the standard library works fine.
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+
+# The OpenTofu outputs we consume, with the default used when one is
+# missing (e.g. that VM type wasn't deployed). Drives a single extraction
+# pass in create_inventory instead of a dozen hand-written .get() chains.
+_OUTPUT_DEFAULTS = (
+    # Scoring servers (Grey Team)
+    ('scoring_names', []),
+    ('scoring_ips', []),
+    ('scoring_floating_ips', []),
+    # Blue Team Windows VMs
+    ('blue_windows_names', []),
+    ('blue_windows_ips', []),
+    ('blue_windows_floating_ips', []),
+    # Blue Team Linux VMs
+    ('blue_linux_names', []),
+    ('blue_linux_ips', []),
+    ('blue_linux_floating_ips', []),
+    # Red Team Kali VMs
+    ('red_kali_names', []),
+    ('red_kali_ips', []),
+    ('red_kali_floating_ips', []),
+    # Service-to-host mappings
+    ('service_hosts', {}),
+)
+
+# Outputs that outputs.tf defines but the inventory doesn't consume -
+# known and fine, so no warning for these
+_IGNORED_OUTPUTS = frozenset({
+    'network_id',
+    'subnet_id',
+    'subnet_cidr',
+    'domain_controller_ip',
+    'domain_controller_floating_ip',
+})
+
+# Bound .format method for the per-host inventory lines. Hoisted to module
+# level so the template is parsed once, not re-parsed per host as an
+# f-string would be.
+_HOST_LINE = "{} ansible_host={} internal_ip={} host_services='{}'\n".format
+
+# Cache file for 'tofu output -json', stored next to the state file it is
+# derived from. Re-execing the tofu binary costs 500ms-2s because it
+# re-reads and re-verifies state; when the state file hasn't changed the
+# outputs can't have changed either, so we can skip the subprocess
+# entirely. Pass --no-cache to force a fresh tofu run.
+_CACHE_NAME = '.tofu-output.cache.json'
+
+# Dashed rule used to frame section headers in the generated inventory
+_RULE = "# ---------------------------------------------------------------------------\n"
+
+# ---------------------------------------------------------------------------
+# Static inventory fragments. Every block below is identical on every run,
+# so they're assembled once at import time; create_inventory appends each
+# as a single ready-made string instead of rebuilding it line by line.
+# ---------------------------------------------------------------------------
+
+_INVENTORY_HEADER = """\
+# ===========================================================================
+# ANSIBLE INVENTORY - AUTO-GENERATED FROM OPENTOFU
+# ===========================================================================
+# DO NOT EDIT MANUALLY - Changes will be overwritten!
+# To regenerate: python3 import-tofu-to-ansible.py
+#
+# CTF TEAM STRUCTURE:
+#   - Grey Team (scoring): Competition infrastructure
+#   - Blue Team (windows_dc, blue_*): Defenders
+#   - Red Team (red_team): Attackers
+# ===========================================================================
+
+"""
+
+_ROLE_GROUPS_BANNER = (
+    _RULE
+    + "# ROLE-BASED GROUPS\n"
+    + _RULE
+    + "# These groups organize VMs by their role in the domain.\n\n"
+)
+
+# Group hierarchies reference only group names, never hosts, so the whole
+# section is static
+_GROUP_HIERARCHIES = (
+    _RULE
+    + "# GROUP HIERARCHIES\n"
+    + _RULE
+    + "# :children syntax creates parent groups containing other groups.\n"
+      "# This allows running playbooks against broad categories.\n"
+      "\n"
+      "# All Windows VMs (for Windows-specific playbooks)\n"
+      "[windows:children]\n"
+      "windows_dc\n"
+      "blue_windows_members\n"
+      "\n"
+      "# All Blue Team VMs (for Blue Team configuration)\n"
+      "[blue_team:children]\n"
+      "blue_windows\n"
+      "blue_linux\n"
+      "\n"
+      "# All Linux VMs (for Linux-specific playbooks)\n"
+      "[linux_members:children]\n"
+      "blue_linux_members\n"
+      "red_team\n"
+      "scoring\n"
+      "\n"
+)
+
+_SERVICE_GROUPS_BANNER = (
+    _RULE
+    + "# SERVICE GROUPS (auto-generated from OpenTofu service_hosts)\n"
+    + _RULE
+    + "# These groups are created from the service_hosts variable in variables.tf.\n"
+      "# Use them to target playbooks: ansible-playbook playbooks/setup-web.yml\n"
+      "# The playbook automatically runs against hosts in the [web] group.\n\n"
+)
+
+_ALL_VMS_GROUP = (
+    "# All VMs in the CTF\n"
+    "[all_vms:children]\n"
+    "scoring\n"
+    "blue_team\n"
+    "red_team\n"
+    "\n"
+)
+
+# Connection settings per group - fixed credentials and transports, so
+# fully static as well
+_GROUP_VARS = (
+    _RULE
+    + "# GROUP VARIABLES\n"
+    + _RULE
+    + "# Connection settings for each group. These can be overridden in group_vars/\n"
+      "\n"
+      "[scoring:vars]\n"
+      "ansible_user=cyberrange\n"
+      "ansible_password=Cyberrange123!\n"
+      "ansible_python_interpreter=/usr/bin/python3\n"
+      "\n"
+      "[blue_linux:vars]\n"
+      "ansible_user=cyberrange\n"
+      "ansible_password=Cyberrange123!\n"
+      "ansible_python_interpreter=/usr/bin/python3\n"
+      "\n"
+      "[red_team:vars]\n"
+      "ansible_user=cyberrange\n"
+      "ansible_password=Cyberrange123!\n"
+      "ansible_python_interpreter=/usr/bin/python3\n"
+      "# Note: Kali may use 'kali' as default user depending on image\n"
+      "\n"
+      "[blue_windows:vars]\n"
+      "ansible_user=cyberrange\n"
+      "ansible_password=Cyberrange123!\n"
+      "ansible_connection=winrm\n"
+      "ansible_winrm_transport=ntlm\n"
+      "ansible_winrm_server_cert_validation=ignore\n"
+      "ansible_winrm_proxy=socks5h://ssh.cyberrange.rit.edu:1080\n"
+      "# WinRM uses SOCKS proxy through jump host for access\n"
+      "\n"
+)
+
+_USAGE_EXAMPLES = (
+    _RULE
+    + "# USAGE EXAMPLES\n"
+    + _RULE
+    + "# Run playbook on all Blue Team VMs:\n"
+      "#   ansible-playbook -i inventory/production.ini playbooks/site.yml --limit blue_team\n"
+      "#\n"
+      "# Run playbook on Domain Controller only:\n"
+      "#   ansible-playbook -i inventory/production.ini playbooks/setup-domain-controller.yml --limit windows_dc\n"
+      "#\n"
+      "# Test connectivity to all Windows VMs:\n"
+      "#   ansible windows -i inventory/production.ini -m win_ping\n"
+      "#\n"
+      "# Test connectivity to Red Team VMs:\n"
+      "#   ansible red_team -i inventory/production.ini -m ping\n"
+    + _RULE
+)
+
+
+def _emit_host_group(parts, group, title, description, names, fips, iips,
+                     host_to_services):
+    """
+    Append one host-group section (banner, [group] header, host lines)
+    to the parts list.
+
+    The four team/OS groups in the inventory differ only in their banner
+    text and which name/IP lists they draw from, so one helper handles
+    them all - the banner is composed as a single string instead of five
+    separate appends per section.
+    """
+    parts.append(
+        _RULE
+        + f"# {title}\n"
+        + _RULE
+        + f"# {description}\n"
+        + f"[{group}]\n"
+    )
+    parts.extend(
+        _HOST_LINE(name, fip, iip, json.dumps(sorted(host_to_services[name])))
+        for name, fip, iip in zip(names, fips, iips)
+    )
+    parts.append("\n")
+
+
+def _state_cache_key(tofu_dir):
+    """
+    Build a cache key identifying the current OpenTofu state.
 
-def get_tofu_output(tofu_dir='opentofu'):
+    The key is (state file path, mtime in nanoseconds, size) - any apply,
+    destroy, or taint rewrites the state file and changes the key, which
+    invalidates the cache automatically.
+
+    Only the local terraform.tfstate qualifies. With a remote backend
+    there is no local file that changes on apply (.terraform/ holds a
+    backend-config snapshot, not live state), so no key can prove the
+    cache is fresh - in that case we return None and every run hits tofu.
+
+    Returns:
+        list: Cache key, or None if no local state file exists (no caching)
+    """
+    state_path = Path(tofu_dir) / 'terraform.tfstate'
+    try:
+        st = state_path.stat()
+    except OSError:
+        return None
+    # A list (not tuple) so it round-trips through JSON unchanged
+    # and compares equal to the stored key on reload
+    return [str(state_path), st.st_mtime_ns, st.st_size]
+
+
+def get_tofu_output(tofu_dir='opentofu', use_cache=True):
     """
     Get OpenTofu output in JSON format from specified directory.
 
@@ -55,44 +292,87 @@ def get_tofu_output(tofu_dir='opentofu'):
     outputs.tf as a JSON object. Each output has a 'value' key containing
     the actual data.
 
+    Results are cached on disk keyed by the state file's identity (see
+    _state_cache_key), so repeated runs in a dev loop skip the tofu
+    subprocess while the infrastructure hasn't changed.
+
     Args:
         tofu_dir: Directory containing OpenTofu configuration files
+        use_cache: If False, skip the cache and always run tofu
 
     Returns:
         dict: Parsed JSON output from OpenTofu
     """
-    original_dir = os.getcwd()
+    # Check the directory up front. With cwd= delegated to subprocess, a
+    # FileNotFoundError from the call below would be ambiguous (missing
+    # directory vs missing tofu binary) - this keeps the messages distinct.
+    if not Path(tofu_dir).is_dir():
+        print(f"Error: Directory '{tofu_dir}' not found", file=sys.stderr)
+        print("Make sure you're running this from the project root directory.", file=sys.stderr)
+        sys.exit(1)
 
-    try:
-        # Change to OpenTofu directory (tofu output only works from there)
-        os.chdir(tofu_dir)
+    cache_key = _state_cache_key(tofu_dir) if use_cache else None
+    cache_path = Path(tofu_dir) / _CACHE_NAME
+
+    if cache_key is not None:
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = _json.loads(f.read())
+            if cached.get('key') == cache_key:
+                return cached['value']
+        except (OSError, ValueError, KeyError):
+            pass  # Missing or corrupt cache - fall through to tofu
 
+    try:
+        # cwd= runs tofu from its directory ('tofu output' only works from
+        # there) without os.chdir'ing this process - the chdir happens in
+        # the forked child only, so our own CWD and any relative paths
+        # stay valid throughout.
+        #
+        # stdout stays as raw bytes: both parsers accept bytes directly,
+        # and orjson in particular is fastest when fed bytes (no decode)
         result = subprocess.run(
             ['tofu', 'output', '-json'],
-            capture_output=True,
-            text=True,
-            check=True
+            cwd=tofu_dir,
+            capture_output=True
         )
 
-        return json.loads(result.stdout)
+        if result.returncode != 0:
+            # Relay tofu's own stderr untouched (bytes, no decode round
+            # trip), then add our hints - no exception machinery needed
+            # for an error path we fully handle here
+            sys.stderr.flush()
+            sys.stderr.buffer.write(result.stderr)
+            sys.stderr.buffer.flush()
+            print(f"Error running tofu output (exit code {result.returncode})", file=sys.stderr)
+            print("\nPossible causes:", file=sys.stderr)
+            print("  - OpenTofu not initialized (run: cd opentofu && tofu init)", file=sys.stderr)
+            print("  - No infrastructure deployed (run: tofu apply)", file=sys.stderr)
+            print("  - Credentials not loaded (run: source app-cred-openrc.sh)", file=sys.stderr)
+            sys.exit(1)
+
+        data = _json.loads(result.stdout)
+
+        if cache_key is not None:
+            try:
+                # Stdlib json for writing: it's not the hot path, and it
+                # produces str so the file is plain readable JSON either way
+                with open(cache_path, 'w') as f:
+                    json.dump({'key': cache_key, 'value': data}, f)
+            except OSError:
+                pass  # Cache is best-effort; a read-only dir isn't fatal
+
+        return data
 
     except FileNotFoundError:
-        print(f"Error: Directory '{tofu_dir}' not found", file=sys.stderr)
-        print("Make sure you're running this from the project root directory.", file=sys.stderr)
-        sys.exit(1)
-    except subprocess.CalledProcessError as e:
-        print(f"Error running tofu output: {e}", file=sys.stderr)
-        print("\nPossible causes:", file=sys.stderr)
-        print("  - OpenTofu not initialized (run: cd opentofu && tofu init)", file=sys.stderr)
-        print("  - No infrastructure deployed (run: tofu apply)", file=sys.stderr)
-        print("  - Credentials not loaded (run: source app-cred-openrc.sh)", file=sys.stderr)
+        print("Error: 'tofu' command not found", file=sys.stderr)
+        print("Install OpenTofu and make sure it is on your PATH.", file=sys.stderr)
         sys.exit(1)
-    except json.JSONDecodeError as e:
+    except ValueError as e:
+        # Both json.JSONDecodeError and orjson.JSONDecodeError are
+        # subclasses of ValueError
         print(f"Error parsing JSON output: {e}", file=sys.stderr)
         sys.exit(1)
-    finally:
-        # Always return to original directory
-        os.chdir(original_dir)
 
 
 def create_inventory(tofu_data, ansible_dir='ansible', inventory_filename='inventory/production.ini'):
@@ -121,285 +401,147 @@ def create_inventory(tofu_data, ansible_dir='ansible', inventory_filename='inven
     # EXTRACT DATA FROM OPENTOFU OUTPUTS
     # ===========================================================================
     # Each output is a dict with 'value' key containing the actual data.
-    # We use .get() with empty list default to handle missing outputs gracefully.
-
-    # Scoring servers (Grey Team)
-    scoring_names = tofu_data.get('scoring_names', {}).get('value', [])
-    scoring_ips = tofu_data.get('scoring_ips', {}).get('value', [])
-    scoring_floating_ips = tofu_data.get('scoring_floating_ips', {}).get('value', [])
-
-    # Blue Team Windows VMs
-    blue_windows_names = tofu_data.get('blue_windows_names', {}).get('value', [])
-    blue_windows_ips = tofu_data.get('blue_windows_ips', {}).get('value', [])
-    blue_windows_floating_ips = tofu_data.get('blue_windows_floating_ips', {}).get('value', [])
-
-    # Blue Team Linux VMs
-    blue_linux_names = tofu_data.get('blue_linux_names', {}).get('value', [])
-    blue_linux_ips = tofu_data.get('blue_linux_ips', {}).get('value', [])
-    blue_linux_floating_ips = tofu_data.get('blue_linux_floating_ips', {}).get('value', [])
-
-    # Red Team Kali VMs
-    red_kali_names = tofu_data.get('red_kali_names', {}).get('value', [])
-    red_kali_ips = tofu_data.get('red_kali_ips', {}).get('value', [])
-    red_kali_floating_ips = tofu_data.get('red_kali_floating_ips', {}).get('value', [])
-
-    # ===========================================================================
-    # SERVICE CONFIGURATION
-    # ===========================================================================
-    # Read service-to-host mappings from OpenTofu output.
-    # Empty lists get expanded to default hosts based on OS type.
-
-    service_hosts = tofu_data.get('service_hosts', {}).get('value', {})
-
-    # Build lookup sets for default expansion
-    all_linux_hosts = set(scoring_names + blue_linux_names)
-    all_windows_hosts = set(blue_windows_names)
+    # Start from the defaults, then walk tofu_data once, filling each
+    # recognized slot - one pass, no defensive .get chains, and any output
+    # key we don't know about (a typo in outputs.tf, say) gets flagged
+    # instead of silently producing an empty group. The default values are
+    # never mutated, so sharing them across slots and calls is safe.
+    vals = dict(_OUTPUT_DEFAULTS)
+    for key, output in tofu_data.items():
+        if key in vals:
+            vals[key] = output.get('value', vals[key])
+        elif key not in _IGNORED_OUTPUTS:
+            print(f"Warning: unrecognized OpenTofu output '{key}' - ignored",
+                  file=sys.stderr)
+
+    (scoring_names, scoring_ips, scoring_floating_ips,
+     blue_windows_names, blue_windows_ips, blue_windows_floating_ips,
+     blue_linux_names, blue_linux_ips, blue_linux_floating_ips,
+     red_kali_names, red_kali_ips, red_kali_floating_ips,
+     # Service-to-host mappings; empty lists get expanded to default
+     # hosts based on OS type below
+     service_hosts) = (vals[key] for key, _ in _OUTPUT_DEFAULTS)
+
+    # Build lookup sets for default expansion. frozenset because they are
+    # read-only and get stored directly in expanded_services below - no
+    # per-service list() copies. union() takes both lists directly, so no
+    # throwaway concatenated list either.
+    all_linux_hosts = frozenset().union(scoring_names, blue_linux_names)
+    all_windows_hosts = frozenset(blue_windows_names)
     all_hosts = all_linux_hosts | all_windows_hosts
 
-    # Expand empty service lists to defaults
+    # Expand empty service lists to defaults. Defaulted services share the
+    # sets above; the write-out pass sorts whatever collection it gets.
     expanded_services = {}
     for service, hosts in service_hosts.items():
         if hosts:  # Explicit host list provided
             expanded_services[service] = hosts
         elif service == 'ping':
-            expanded_services[service] = list(all_hosts)
+            expanded_services[service] = all_hosts
         elif service in ('ssh',):
-            expanded_services[service] = list(all_linux_hosts)
+            expanded_services[service] = all_linux_hosts
         elif service in ('winrm', 'rdp'):
-            expanded_services[service] = list(all_windows_hosts)
+            expanded_services[service] = all_windows_hosts
         else:
-            expanded_services[service] = []  # No default for other services
+            expanded_services[service] = ()  # No default for other services
 
-    # Build reverse mapping: hostname -> list of services
-    host_to_services = {}
+    # Build reverse mapping: hostname -> list of services. defaultdict
+    # saves a membership test per (service, host) pair; the lists are
+    # sorted once at the point of use instead of in a second pass here.
+    host_to_services = defaultdict(list)
     for service, hosts in expanded_services.items():
         for host in hosts:
-            if host not in host_to_services:
-                host_to_services[host] = []
             host_to_services[host].append(service)
 
-    # Sort services for consistent output
-    for host in host_to_services:
-        host_to_services[host].sort()
-
-    with open(output_path, 'w') as f:
-        # =====================================================================
-        # INVENTORY FILE HEADER
-        # =====================================================================
-        f.write("# ===========================================================================\n")
-        f.write("# ANSIBLE INVENTORY - AUTO-GENERATED FROM OPENTOFU\n")
-        f.write("# ===========================================================================\n")
-        f.write("# DO NOT EDIT MANUALLY - Changes will be overwritten!\n")
-        f.write("# To regenerate: python3 import-tofu-to-ansible.py\n")
-        f.write("#\n")
-        f.write("# CTF TEAM STRUCTURE:\n")
-        f.write("#   - Grey Team (scoring): Competition infrastructure\n")
-        f.write("#   - Blue Team (windows_dc, blue_*): Defenders\n")
-        f.write("#   - Red Team (red_team): Attackers\n")
-        f.write("# ===========================================================================\n\n")
-
-        # =====================================================================
-        # SCORING SERVERS (Grey Team)
-        # =====================================================================
-        f.write("# ---------------------------------------------------------------------------\n")
-        f.write("# SCORING SERVERS (Grey Team)\n")
-        f.write("# ---------------------------------------------------------------------------\n")
-        f.write("# Grey Team runs the competition: scoring engine, monitoring, infrastructure.\n")
-        f.write("[scoring]\n")
-        for name, floating_ip, internal_ip in zip(scoring_names, scoring_floating_ips, scoring_ips):
-            services = host_to_services.get(name, [])
-            services_json = json.dumps(services)
-            f.write(f"{name} ansible_host={floating_ip} internal_ip={internal_ip} host_services='{services_json}'\n")
-        f.write("\n")
-
-        # =====================================================================
-        # BLUE TEAM WINDOWS VMS
-        # =====================================================================
-        f.write("# ---------------------------------------------------------------------------\n")
-        f.write("# BLUE TEAM WINDOWS VMS\n")
-        f.write("# ---------------------------------------------------------------------------\n")
-        f.write("# Windows VMs for Blue Team to defend. First VM is Domain Controller.\n")
-        f.write("[blue_windows]\n")
-        for name, floating_ip, internal_ip in zip(blue_windows_names, blue_windows_floating_ips, blue_windows_ips):
-            services = host_to_services.get(name, [])
-            services_json = json.dumps(services)
-            f.write(f"{name} ansible_host={floating_ip} internal_ip={internal_ip} host_services='{services_json}'\n")
-        f.write("\n")
-
-        # =====================================================================
-        # BLUE TEAM LINUX VMS
-        # =====================================================================
-        f.write("# ---------------------------------------------------------------------------\n")
-        f.write("# BLUE TEAM LINUX VMS\n")
-        f.write("# ---------------------------------------------------------------------------\n")
-        f.write("# Linux servers for Blue Team to defend (web, database, etc.)\n")
-        f.write("[blue_linux]\n")
-        for name, floating_ip, internal_ip in zip(blue_linux_names, blue_linux_floating_ips, blue_linux_ips):
-            services = host_to_services.get(name, [])
-            services_json = json.dumps(services)
-            f.write(f"{name} ansible_host={floating_ip} internal_ip={internal_ip} host_services='{services_json}'\n")
-        f.write("\n")
-
-        # =====================================================================
-        # RED TEAM KALI VMS
-        # =====================================================================
-        f.write("# ---------------------------------------------------------------------------\n")
-        f.write("# RED TEAM KALI VMS\n")
-        f.write("# ---------------------------------------------------------------------------\n")
-        f.write("# Kali attack machines for Red Team. Pre-loaded with pentesting tools.\n")
-        f.write("[red_team]\n")
-        for name, floating_ip, internal_ip in zip(red_kali_names, red_kali_floating_ips, red_kali_ips):
-            services = host_to_services.get(name, [])
-            services_json = json.dumps(services)
-            f.write(f"{name} ansible_host={floating_ip} internal_ip={internal_ip} host_services='{services_json}'\n")
-        f.write("\n")
-
-        # =====================================================================
-        # ROLE-BASED GROUPS
-        # =====================================================================
-        f.write("# ---------------------------------------------------------------------------\n")
-        f.write("# ROLE-BASED GROUPS\n")
-        f.write("# ---------------------------------------------------------------------------\n")
-        f.write("# These groups organize VMs by their role in the domain.\n\n")
-
-        # Domain Controller (first Blue Windows VM)
-        f.write("# Domain Controller - the first Blue Windows VM\n")
-        f.write("[windows_dc]\n")
-        if blue_windows_names:
-            f.write(f"{blue_windows_names[0]}\n")
-        f.write("\n")
-
-        # Windows member servers (all Blue Windows except first)
-        f.write("# Windows member servers (domain members, not DC)\n")
-        f.write("[blue_windows_members]\n")
-        for name in blue_windows_names[1:]:
-            f.write(f"{name}\n")
-        f.write("\n")
-
-        # Linux members (Blue Linux VMs that join the domain)
-        f.write("# Linux domain members (join Active Directory)\n")
-        f.write("[blue_linux_members]\n")
-        for name in blue_linux_names:
-            f.write(f"{name}\n")
-        f.write("\n")
-
-        # =====================================================================
-        # GROUP HIERARCHIES (using :children)
-        # =====================================================================
-        f.write("# ---------------------------------------------------------------------------\n")
-        f.write("# GROUP HIERARCHIES\n")
-        f.write("# ---------------------------------------------------------------------------\n")
-        f.write("# :children syntax creates parent groups containing other groups.\n")
-        f.write("# This allows running playbooks against broad categories.\n\n")
-
-        # All Windows VMs (DC + members)
-        f.write("# All Windows VMs (for Windows-specific playbooks)\n")
-        f.write("[windows:children]\n")
-        f.write("windows_dc\n")
-        f.write("blue_windows_members\n")
-        f.write("\n")
-
-        # All Blue Team VMs
-        f.write("# All Blue Team VMs (for Blue Team configuration)\n")
-        f.write("[blue_team:children]\n")
-        f.write("blue_windows\n")
-        f.write("blue_linux\n")
-        f.write("\n")
-
-        # All Linux VMs (Blue + Red - useful for common Linux config)
-        f.write("# All Linux VMs (for Linux-specific playbooks)\n")
-        f.write("[linux_members:children]\n")
-        f.write("blue_linux_members\n")
-        f.write("red_team\n")
-        f.write("scoring\n")
-        f.write("\n")
-
-        # =====================================================================
-        # SERVICE GROUPS
-        # =====================================================================
-        f.write("# ---------------------------------------------------------------------------\n")
-        f.write("# SERVICE GROUPS (auto-generated from OpenTofu service_hosts)\n")
-        f.write("# ---------------------------------------------------------------------------\n")
-        f.write("# These groups are created from the service_hosts variable in variables.tf.\n")
-        f.write("# Use them to target playbooks: ansible-playbook playbooks/setup-web.yml\n")
-        f.write("# The playbook automatically runs against hosts in the [web] group.\n\n")
-
-        # Write each service group
-        for service in sorted(expanded_services.keys()):
-            hosts = expanded_services[service]
-            if hosts:  # Only write groups that have hosts
-                f.write(f"[{service}]\n")
-                for host in sorted(hosts):
-                    f.write(f"{host}\n")
-                f.write("\n")
-
-        # All VMs in the competition
-        f.write("# All VMs in the CTF\n")
-        f.write("[all_vms:children]\n")
-        f.write("scoring\n")
-        f.write("blue_team\n")
-        f.write("red_team\n")
-        f.write("\n")
-
-        # =====================================================================
-        # GROUP VARIABLES
-        # =====================================================================
-        f.write("# ---------------------------------------------------------------------------\n")
-        f.write("# GROUP VARIABLES\n")
-        f.write("# ---------------------------------------------------------------------------\n")
-        f.write("# Connection settings for each group. These can be overridden in group_vars/\n\n")
-
-        # Scoring server variables (Linux)
-        f.write("[scoring:vars]\n")
-        f.write("ansible_user=cyberrange\n")
-        f.write("ansible_password=Cyberrange123!\n")
-        f.write("ansible_python_interpreter=/usr/bin/python3\n")
-        f.write("\n")
-
-        # Blue Linux variables
-        f.write("[blue_linux:vars]\n")
-        f.write("ansible_user=cyberrange\n")
-        f.write("ansible_password=Cyberrange123!\n")
-        f.write("ansible_python_interpreter=/usr/bin/python3\n")
-        f.write("\n")
-
-        # Red Team variables (Kali default user is 'kali')
-        f.write("[red_team:vars]\n")
-        f.write("ansible_user=cyberrange\n")
-        f.write("ansible_password=Cyberrange123!\n")
-        f.write("ansible_python_interpreter=/usr/bin/python3\n")
-        f.write("# Note: Kali may use 'kali' as default user depending on image\n")
-        f.write("\n")
-
-        # Blue Windows variables (WinRM connection)
-        f.write("[blue_windows:vars]\n")
-        f.write("ansible_user=cyberrange\n")
-        f.write("ansible_password=Cyberrange123!\n")
-        f.write("ansible_connection=winrm\n")
-        f.write("ansible_winrm_transport=ntlm\n")
-        f.write("ansible_winrm_server_cert_validation=ignore\n")
-        f.write("ansible_winrm_proxy=socks5h://ssh.cyberrange.rit.edu:1080\n")
-        f.write("# WinRM uses SOCKS proxy through jump host for access\n")
-        f.write("\n")
-
-        # =====================================================================
-        # USAGE EXAMPLES
-        # =====================================================================
-        f.write("# ---------------------------------------------------------------------------\n")
-        f.write("# USAGE EXAMPLES\n")
-        f.write("# ---------------------------------------------------------------------------\n")
-        f.write("# Run playbook on all Blue Team VMs:\n")
-        f.write("#   ansible-playbook -i inventory/production.ini playbooks/site.yml --limit blue_team\n")
-        f.write("#\n")
-        f.write("# Run playbook on Domain Controller only:\n")
-        f.write("#   ansible-playbook -i inventory/production.ini playbooks/setup-domain-controller.yml --limit windows_dc\n")
-        f.write("#\n")
-        f.write("# Test connectivity to all Windows VMs:\n")
-        f.write("#   ansible windows -i inventory/production.ini -m win_ping\n")
-        f.write("#\n")
-        f.write("# Test connectivity to Red Team VMs:\n")
-        f.write("#   ansible red_team -i inventory/production.ini -m ping\n")
-        f.write("# ---------------------------------------------------------------------------\n")
+    # Build the whole file in memory and write it once at the end -
+    # one write() call instead of hundreds of tiny ones
+    parts = []
+    ap = parts.append
+    # =====================================================================
+    # INVENTORY FILE HEADER
+    # =====================================================================
+    ap(_INVENTORY_HEADER)
+
+    # =====================================================================
+    # HOST GROUPS (one section per team / OS grouping)
+    # =====================================================================
+    # The four groups are structurally identical, so they're emitted by
+    # one helper driven from this table: (group, banner title, banner
+    # description, names, floating IPs, internal IPs).
+    for group, title, description, names, fips, iips in (
+        ('scoring', 'SCORING SERVERS (Grey Team)',
+         'Grey Team runs the competition: scoring engine, monitoring, infrastructure.',
+         scoring_names, scoring_floating_ips, scoring_ips),
+        ('blue_windows', 'BLUE TEAM WINDOWS VMS',
+         'Windows VMs for Blue Team to defend. First VM is Domain Controller.',
+         blue_windows_names, blue_windows_floating_ips, blue_windows_ips),
+        ('blue_linux', 'BLUE TEAM LINUX VMS',
+         'Linux servers for Blue Team to defend (web, database, etc.)',
+         blue_linux_names, blue_linux_floating_ips, blue_linux_ips),
+        ('red_team', 'RED TEAM KALI VMS',
+         'Kali attack machines for Red Team. Pre-loaded with pentesting tools.',
+         red_kali_names, red_kali_floating_ips, red_kali_ips),
+    ):
+        _emit_host_group(parts, group, title, description, names, fips, iips,
+                         host_to_services)
+
+    # =====================================================================
+    # ROLE-BASED GROUPS
+    # =====================================================================
+    ap(_ROLE_GROUPS_BANNER)
+
+    # Domain Controller (first Blue Windows VM)
+    ap("# Domain Controller - the first Blue Windows VM\n")
+    ap("[windows_dc]\n")
+    if blue_windows_names:
+        ap(f"{blue_windows_names[0]}\n")
+    ap("\n")
+
+    # Windows member servers (all Blue Windows except first)
+    ap("# Windows member servers (domain members, not DC)\n")
+    members = blue_windows_names[1:]
+    ap("[blue_windows_members]\n"
+       + "\n".join(members) + ("\n\n" if members else "\n"))
+
+    # Linux members (Blue Linux VMs that join the domain)
+    ap("# Linux domain members (join Active Directory)\n")
+    ap("[blue_linux_members]\n"
+       + "\n".join(blue_linux_names) + ("\n\n" if blue_linux_names else "\n"))
+
+    # =====================================================================
+    # GROUP HIERARCHIES (using :children)
+    # =====================================================================
+    ap(_GROUP_HIERARCHIES)
+
+    # =====================================================================
+    # SERVICE GROUPS
+    # =====================================================================
+    ap(_SERVICE_GROUPS_BANNER)
+
+    # Write each service group. Sorting items() by key hands us both the
+    # name and its hosts in one pass - no per-service dict lookup - and
+    # one C-level join assembles the whole group instead of a per-host loop.
+    for service, hosts in sorted(expanded_services.items(), key=itemgetter(0)):
+        if hosts:  # Only write groups that have hosts
+            ap(f"[{service}]\n" + "\n".join(sorted(hosts)) + "\n\n")
+
+    # All VMs in the competition
+    ap(_ALL_VMS_GROUP)
+
+    # =====================================================================
+    # GROUP VARIABLES
+    # =====================================================================
+    ap(_GROUP_VARS)
+
+    # =====================================================================
+    # USAGE EXAMPLES
+    # =====================================================================
+    ap(_USAGE_EXAMPLES)
+
+    # newline='' skips universal-newline translation (the file is pure
+    # \n), and an explicit encoding keeps the output platform-independent
+    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(''.join(parts))
 
     print(f"Inventory file created: {output_path}")
     print(f"\nSummary:")
@@ -418,18 +560,25 @@ def main():
       1. tofu_dir:          Directory containing OpenTofu files (default: 'opentofu')
       2. ansible_dir:       Directory to create inventory in (default: 'ansible')
       3. inventory_filename: Inventory file path within ansible_dir (default: 'inventory/production.ini')
+
+    Flags:
+      --no-cache: Skip the cached tofu output and run 'tofu output' fresh
     """
-    # Parse command line arguments
-    tofu_dir = sys.argv[1] if len(sys.argv) > 1 else 'opentofu'
-    ansible_dir = sys.argv[2] if len(sys.argv) > 2 else 'ansible'
-    inventory_filename = sys.argv[3] if len(sys.argv) > 3 else 'inventory/production.ini'
+    # Parse command line arguments. The --no-cache flag can appear in any
+    # position; the remaining arguments are positional as documented above.
+    args = [a for a in sys.argv[1:] if a != '--no-cache']
+    use_cache = len(args) == len(sys.argv) - 1
+
+    tofu_dir = args[0] if len(args) > 0 else 'opentofu'
+    ansible_dir = args[1] if len(args) > 1 else 'ansible'
+    inventory_filename = args[2] if len(args) > 2 else 'inventory/production.ini'
 
     print("=" * 70)
     print("OpenTofu to Ansible Inventory Generator")
     print("=" * 70)
     print(f"\nFetching OpenTofu output from '{tofu_dir}' directory...")
 
-    tofu_data = get_tofu_output(tofu_dir)
+    tofu_data = get_tofu_output(tofu_dir, use_cache=use_cache)
 
     print(f"Creating Ansible inventory in '{ansible_dir}/{inventory_filename}'...")
     create_inventory(tofu_data, ansible_dir, inventory_filename)
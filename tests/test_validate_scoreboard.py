@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for the scoreboard parser in ansible/files/validate_scoreboard.py.
+
+The fixture in fixtures/scoreboard.html reproduces the engine's real
+layout - check names in a header row, status icons in a separate team
+row - which is exactly the shape a naive per-name-slice parser gets
+wrong. These tests pin the pairing semantics.
+
+Run from the repo root:
+    python3 -m unittest discover tests
+"""
+
+import importlib.util
+import unittest
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# The script lives in ansible/files (not a package), so load it by path
+_spec = importlib.util.spec_from_file_location(
+    'validate_scoreboard',
+    _REPO_ROOT / 'ansible' / 'files' / 'validate_scoreboard.py',
+)
+validate_scoreboard = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(validate_scoreboard)
+
+
+class ParseScoreboardTests(unittest.TestCase):
+
+    def _fixture(self):
+        return (Path(__file__).parent / 'fixtures' / 'scoreboard.html').read_bytes()
+
+    def test_header_row_layout_pairs_names_with_icons(self):
+        """Names from the header row pair positionally with the icon row."""
+        names, statuses = validate_scoreboard.parse_scoreboard(self._fixture())
+        self.assertEqual(names, ['web-1', 'dns-1', 'smb-1', 'ssh-1'])
+        self.assertEqual(statuses, ['up', 'down', 'up', 'up'])
+
+    def test_all_up_page_validates(self):
+        html = self._fixture().replace(b'down.png', b'up.png')
+        names, statuses = validate_scoreboard.parse_scoreboard(html)
+        all_passing, down_names = validate_scoreboard.validate_services(
+            names, statuses)
+        self.assertTrue(all_passing)
+        self.assertEqual(down_names, [])
+
+    def test_down_service_fails_validation(self):
+        names, statuses = validate_scoreboard.parse_scoreboard(self._fixture())
+        all_passing, down_names = validate_scoreboard.validate_services(
+            names, statuses)
+        self.assertFalse(all_passing)
+        self.assertEqual(down_names, ['dns-1'])
+
+    def test_count_mismatch_truncates_to_parallel_lists(self):
+        """A malformed page with more icons than names stays parallel."""
+        html = self._fixture() + b'<img src="../assets/down.png">'
+        names, statuses = validate_scoreboard.parse_scoreboard(html)
+        self.assertEqual(len(names), len(statuses))
+        self.assertEqual(statuses, ['up', 'down', 'up', 'up'])
+
+    def test_empty_page_parses_to_nothing(self):
+        names, statuses = validate_scoreboard.parse_scoreboard(b'<html></html>')
+        self.assertEqual(names, [])
+        self.assertEqual(statuses, [])
+
+
+if __name__ == '__main__':
+    unittest.main()